@@ -45,7 +45,7 @@ tipper_ctrl = ctrl.ControlSystem([rule1, rule2, rule3, rule4, rule5, rule6, rule
 
 # zad3 test sterownika
 print("=== TEST STEROWNIKA ===")
-tipper_simulation = ctrl.ControlSystemSimulation(tipper_ctrl)
+tipper_simulation = ctrl.ControlSystemSimulation(tipper_ctrl, flush_after_run=10_000)
 
 test_cases = [
     (2, 2, "Zła obsługa + złe jedzenie"),
@@ -59,20 +59,23 @@ test_cases = [
     (6.5, 6.5, "Oba czynniki na poziomie 6.5")
 ]
 
-for service_quality, food_quality, description in test_cases:
-    # ustalamy wejście ostre (crisp)
-    tipper_simulation.input['quality'] = service_quality
-    tipper_simulation.input['food_quality'] = food_quality
+# ustalamy wejścia ostre (crisp) dla wszystkich przypadków naraz - jako tablice
+# osobna symulacja, bo skfuzzy resetuje symulację przy powrocie do wejść skalarnych
+tipper_batch = ctrl.ControlSystemSimulation(tipper_ctrl)
+tipper_batch.input['quality'] = np.array([case[0] for case in test_cases], dtype=float)
+tipper_batch.input['food_quality'] = np.array([case[1] for case in test_cases], dtype=float)
 
-    # fuzzyfikacja wejścia ostrego - zamiana go na wejście rozmyte
-    # podstawienie rozmytego wejścia do reguł
-    # odczytanie z reguł rozmytego wyjścia
-    # defuzzyfikacja zmiennej wyjściowej
-    tipper_simulation.compute()
+# fuzzyfikacja wejścia ostrego - zamiana go na wejście rozmyte
+# podstawienie rozmytego wejścia do reguł
+# odczytanie z reguł rozmytego wyjścia
+# defuzzyfikacja zmiennej wyjściowej
+# jedno compute() dla wszystkich przypadków testowych
+tipper_batch.compute()
 
+for (service_quality, food_quality, description), tip_value in zip(test_cases, tipper_batch.output['tip']):
     print(f"\n{description}")
     print(f"obsluga: {service_quality}, Jedzenie: {food_quality}")
-    print(f"napiwek: {tipper_simulation.output['tip']:.2f}%")
+    print(f"napiwek: {tip_value:.2f}%")
 
 # wizualizacja wybranego przypadku
 print("============================================")
@@ -4,63 +4,50 @@ import matplotlib.pyplot as plt
 # zad1 - funkcja trojkatna
 def triangle(x, a, b, c):
     """
-    fun przyn trojkatna
+    fun przyn trojkatna (dziala tez na tablicach numpy)
     a - lewy dolny wierzchołek
     b - gorny wierzchołek  
     c - pr dolny wierzchołek
     """
-    # czy x jest poniżej a lub powyżej c - wtedy przynależność = 0
-    if x <= a or x >= c:
-        return 0.0
-    # x jest między a i b - rośnie liniowo od 0 do 1
-    elif a < x <= b:
-        return (x - a) / (b - a)
-    # x jest między b i c - maleje liniowo od 1 do 0
-    elif b < x < c:
-        return (c - x) / (c - b)
-    else:
-        return 0.0
+    x = np.asarray(x, dtype=float)
+    # lewe zbocze rosnie od 0 do 1, prawe maleje od 1 do 0
+    # minimum zboczy obcięte od dołu do 0 - poza [a, c] przynależność = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.maximum(0.0, np.minimum((x - a) / (b - a), (c - x) / (c - b)))
+    return np.nan_to_num(result, nan=0.0)
 
 # zad1 - funkcja trapezowa
 def trapezoid(x, a, b, c, d):
     """
-    fun przyn trapezowa
+    fun przyn trapezowa (dziala tez na tablicach numpy)
     a - l dolny wierzchołek
     b - l górny wierzchołek
     c - p górny wierzchołek  
     d - p dolny wierzchołek
     """
-    # na lewo lub prawo od trapezu
-    if x <= a or x >= d:
-        return 0.0
-    # na plaskim szczycie trapezu
-    elif b <= x <= c:
-        return 1.0
-    # na lewym zboczu (rosnie)
-    elif a < x < b:
-        return (x - a) / (b - a)
-    # na prawym zboczu (maleje)
-    elif c < x < d:
-        return (d - x) / (d - c)
-    else:
-        return 0.0
+    x = np.asarray(x, dtype=float)
+    # minimum zboczy obcięte do [0, 1] - na plaskim szczycie przynależność = 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.clip(np.minimum((x - a) / (b - a), (d - x) / (d - c)), 0.0, 1.0)
+    return np.nan_to_num(result, nan=0.0)
 
 # test funkcji -  wart brzegowe
 print("=== TEST FUNKCJI TROJKATNEJ ===")
-x_values = [2, 3, 4, 5, 6]
-for x in x_values:
-    result = triangle(x, 3, 5, 7)  # trojkat od 3 do 7 z wierzchołkiem w 5
+x_values = np.array([2, 3, 4, 5, 6])
+# jedno wywolanie na calej tablicy zamiast petli po punktach
+triangle_results = triangle(x_values, 3, 5, 7)  # trojkat od 3 do 7 z wierzchołkiem w 5
+for x, result in zip(x_values, triangle_results):
     print(f"x={x}: {result}")
 
 print("\n=== TEST FUNKCJI TRAPEZOWEJ ===")  
-for x in x_values:
-    result = trapezoid(x, 2, 4, 6, 8)  # trapez od 2 do 8 z wyplaszczeniem od 4 do 6
+trapezoid_results = trapezoid(x_values, 2, 4, 6, 8)  # trapez od 2 do 8 z wyplaszczeniem od 4 do 6
+for x, result in zip(x_values, trapezoid_results):
     print(f"x={x}: {result}")
 
 # wizualizacje
 x_range = np.linspace(0, 10, 100)
-triangle_vals = [triangle(x, 3, 5, 7) for x in x_range]
-trapezoid_vals = [trapezoid(x, 2, 4, 6, 8) for x in x_range]
+triangle_vals = triangle(x_range, 3, 5, 7)
+trapezoid_vals = trapezoid(x_range, 2, 4, 6, 8)
 
 plt.figure(figsize=(12, 4))
 
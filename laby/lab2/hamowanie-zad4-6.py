@@ -31,7 +31,7 @@ rule3 = ctrl.Rule(distance['DUŻY'], braking['BRAK'])
 
 # sterownik + symulacja
 braking_ctrl = ctrl.ControlSystem([rule1, rule2, rule3])
-braking_sim = ctrl.ControlSystemSimulation(braking_ctrl)
+braking_sim = ctrl.ControlSystemSimulation(braking_ctrl, flush_after_run=10_000)
 braking_sim.input['distance'] = 12
 braking_sim.compute()
 print(f"zad4 - Wynik hamowania: {braking_sim.output['braking']:.2f}")
@@ -60,7 +60,7 @@ rule10 = ctrl.Rule(distance['DUŻY'], braking['BRAK'])
 
 # sterownik i symulacja
 braking_ctrl2 = ctrl.ControlSystem([rule4, rule5, rule6, rule7, rule8, rule9, rule10])
-braking_sim2 = ctrl.ControlSystemSimulation(braking_ctrl2)
+braking_sim2 = ctrl.ControlSystemSimulation(braking_ctrl2, flush_after_run=10_000)
 braking_sim2.input['distance'] = 12
 braking_sim2.input['humidity'] = 45
 braking_sim2.compute()
@@ -92,7 +92,7 @@ rule19 = ctrl.Rule(distance['DUŻY'] & ice['DUŻE'], braking['MOCNE'])
 
 # sterownik i symulacja
 braking_ctrl3 = ctrl.ControlSystem([rule11, rule12, rule13, rule14, rule15, rule16, rule17, rule18, rule19])
-braking_sim3 = ctrl.ControlSystemSimulation(braking_ctrl3)
+braking_sim3 = ctrl.ControlSystemSimulation(braking_ctrl3, flush_after_run=10_000)
 braking_sim3.input['distance'] = 12
 braking_sim3.input['ice'] = 60
 braking_sim3.compute()
@@ -38,7 +38,7 @@ rule4 = ctrl.Rule(size['large'] & weight['large'], quality['good'])
 
 # sterownik rozmyty
 fruit_quality_ctrl = ctrl.ControlSystem([rule1, rule2, rule3, rule4])
-fruit_quality_sim = ctrl.ControlSystemSimulation(fruit_quality_ctrl)
+fruit_quality_sim = ctrl.ControlSystemSimulation(fruit_quality_ctrl, flush_after_run=10_000)
 
 # Testowanie sterownik
 test_cases = [
@@ -48,12 +48,17 @@ test_cases = [
     (8, 85)    # duży rozmiar, duża waga -> dobra jakość
 ]
 
+# wszystkie przypadki testowe liczone jednym wywolaniem compute() - wejscia jako tablice
+# osobna symulacja, bo skfuzzy resetuje symulacje przy powrocie do wejsc skalarnych
+fruit_quality_batch = ctrl.ControlSystemSimulation(fruit_quality_ctrl)
+sizes, weights = np.array(test_cases, dtype=float).T
+fruit_quality_batch.input['size'] = sizes
+fruit_quality_batch.input['weight'] = weights
+fruit_quality_batch.compute()
+results = fruit_quality_batch.output['quality']
+
 print("\nWyniki testowania sterownika:")
-for i, (size_val, weight_val) in enumerate(test_cases, 1):
-    fruit_quality_sim.input['size'] = size_val
-    fruit_quality_sim.input['weight'] = weight_val
-    fruit_quality_sim.compute()
-    result = fruit_quality_sim.output['quality']
+for i, ((size_val, weight_val), result) in enumerate(zip(test_cases, results), 1):
 
     # Określenie kategorii jakości na podstawie wyniku
     if result <= 0.33:
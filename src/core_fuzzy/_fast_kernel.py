@@ -0,0 +1,182 @@
+"""
+Szybka ścieżka wnioskowania rozmytego dla FuzzyThrottleController.
+
+Odtwarza wnioskowanie Mamdaniego ze skfuzzy (AND = min, OR = max,
+implikacja = min, agregacja = max, defuzyfikacja centroidem) dla ustalonej
+bazy reguł, bez przechodzenia grafu ControlSystemSimulation przy każdym
+wywołaniu.
+"""
+
+import numpy as np
+
+
+def compile_rules(rule_table, err_terms, acc_terms, out_terms):
+    """
+    Zamienia tabelę reguł opartą na nazwach termów na indeksy.
+
+    Args:
+        rule_table: krotki (termy speed_error, termy acceleration, term throttle)
+        err_terms, acc_terms, out_terms: kolejność termów zmiennych
+
+    Returns:
+        lista krotek (indeksy speed_error, indeksy acceleration lub None, indeks throttle)
+    """
+    rules = []
+    for err, acc, out in rule_table:
+        err_idx = tuple(err_terms.index(term) for term in err)
+        acc_idx = None if acc is None else tuple(acc_terms.index(term) for term in acc)
+        rules.append((err_idx, acc_idx, out_terms.index(out)))
+    return rules
+
+
+def index_rules(rules, n_err, n_acc):
+    """
+    Buduje indeks: term przesłanki -> numery reguł, które z niego korzystają.
+
+    Args:
+        rules: reguły w postaci indeksów (patrz `compile_rules`)
+        n_err, n_acc: liczba termów speed_error i acceleration
+
+    Returns:
+        (reguły per term speed_error, reguły per term acceleration,
+         reguły bez warunku na acceleration)
+    """
+    by_err = [[] for _ in range(n_err)]
+    by_acc = [[] for _ in range(n_acc)]
+    acc_free = []
+    for rule_id, (err_idx, acc_idx, _) in enumerate(rules):
+        for i in err_idx:
+            by_err[i].append(rule_id)
+        if acc_idx is None:
+            acc_free.append(rule_id)
+        else:
+            for i in acc_idx:
+                by_acc[i].append(rule_id)
+    return by_err, by_acc, acc_free
+
+
+def active_rules(err_mu, acc_mu, rule_index):
+    """
+    Zwraca numery reguł, których wszystkie przesłanki mają niezerowy stopień.
+
+    Termy o zerowej przynależności są nieaktywne, więc reguły odwołujące się
+    wyłącznie do nich są pomijane bez obliczania AND.
+    """
+    by_err, by_acc, acc_free = rule_index
+    err_live = set()
+    for i, mu in enumerate(err_mu):
+        if mu > 0.0:
+            err_live.update(by_err[i])
+    acc_live = set(acc_free)
+    for i, mu in enumerate(acc_mu):
+        if mu > 0.0:
+            acc_live.update(by_acc[i])
+    return err_live & acc_live
+
+
+def fire_rules(err_mu, acc_mu, rules, n_out, rule_index):
+    """
+    Oblicza siłę aktywacji każdego termu wyjściowego dla wejść skalarnych.
+
+    Args:
+        err_mu: stopnie przynależności termów speed_error
+        acc_mu: stopnie przynależności termów acceleration
+        rules: reguły w postaci indeksów (patrz `compile_rules`)
+        n_out: liczba termów wyjściowych
+        rule_index: indeks termów -> reguł (patrz `index_rules`)
+
+    Returns:
+        lista poziomów odcięcia termów wyjściowych
+    """
+    cuts = [0.0] * n_out
+    for rule_id in active_rules(err_mu, acc_mu, rule_index):
+        err_idx, acc_idx, out_idx = rules[rule_id]
+        strength = max([err_mu[i] for i in err_idx])
+        if acc_idx is not None:
+            strength = min(strength, max([acc_mu[i] for i in acc_idx]))
+        if strength > cuts[out_idx]:
+            cuts[out_idx] = strength
+    return cuts
+
+
+def aggregate(cuts, consequent_mfs):
+    """
+    Przycina funkcje przynależności wyjścia i agreguje je operatorem max.
+
+    Args:
+        cuts: poziomy odcięcia o kształcie (n_out, ...)
+        consequent_mfs: funkcje przynależności wyjścia o kształcie (n_out, len(universe))
+
+    Returns:
+        zagregowana funkcja przynależności o kształcie (..., len(universe))
+    """
+    cuts = np.asarray(cuts)
+    mfs = consequent_mfs.reshape(
+        (consequent_mfs.shape[0],) + (1,) * (cuts.ndim - 1) + (consequent_mfs.shape[1],)
+    )
+    return np.max(np.minimum(cuts[..., None], mfs), axis=0)
+
+
+def centroid_weights(universe):
+    """
+    Wagi centroidu łamanej dla ustalonego uniwersum, o kształcie (len(universe), 2).
+
+    Moment i pole łamanej (każdy odcinek uniwersum to trapez) są liniowe
+    względem wartości funkcji przynależności, więc zależność od uniwersum
+    można policzyć raz: [moment, pole] = mf @ wagi.
+    """
+    x1, x2 = universe[:-1], universe[1:]
+    width = x2 - x1
+    weights = np.zeros((universe.size, 2), dtype=universe.dtype)
+    weights[:-1, 0] += width * (2 * x1 + x2) / 6
+    weights[1:, 0] += width * (x1 + 2 * x2) / 6
+    weights[:-1, 1] += width / 2
+    weights[1:, 1] += width / 2
+    return weights
+
+
+def centroid(weights, mf):
+    """
+    Defuzyfikacja centroidem wzdłuż ostatniej osi (jak `skfuzzy.defuzz`).
+
+    Args:
+        weights: wagi z `centroid_weights` dla uniwersum wyjścia
+        mf: funkcja przynależności o kształcie (..., len(universe))
+    """
+    moment_area = mf @ weights
+    area = moment_area[..., 1]
+    return moment_area[..., 0] / np.fmax(area, np.finfo(area.dtype).eps)
+
+
+def compute_throttle_fast(err_mu, acc_mu, rules, rule_index, centroid_w, consequent_mfs,
+                          out=None):
+    """
+    Pełne wnioskowanie dla jednej pary wejść.
+
+    Args:
+        err_mu: stopnie przynależności termów speed_error
+        acc_mu: stopnie przynależności termów acceleration
+        rules: reguły w postaci indeksów (patrz `compile_rules`)
+        rule_index: indeks termów -> reguł (patrz `index_rules`)
+        centroid_w: wagi centroidu uniwersum wyjścia (patrz `centroid_weights`)
+        consequent_mfs: funkcje przynależności wyjścia (n_out, len(universe))
+        out: opcjonalny bufor roboczy (2, len(universe)) współdzielony między
+            wywołaniami; None - alokowany przy każdym wywołaniu
+
+    Returns:
+        throttle: wartość przepustnicy
+    """
+    cuts = fire_rules(err_mu, acc_mu, rules, consequent_mfs.shape[0], rule_index)
+    
+    if out is None:
+        out = np.empty((2, consequent_mfs.shape[1]))
+    aggregated, clipped = out
+    aggregated.fill(0.0)
+    
+    # Przycinamy tylko aktywne termy wyjściowe (wiersze MF bez kopiowania
+    # podzbioru) - pozostałe dają zerowy wkład
+    for i, cut in enumerate(cuts):
+        if cut > 0.0:
+            np.minimum(consequent_mfs[i], cut, out=clipped)
+            np.maximum(aggregated, clipped, out=aggregated)
+    return float(centroid(centroid_w, aggregated))
@@ -5,11 +5,47 @@ Implementuje logikę rozmytą do obliczania wartości przepustnicy (throttle)
 na podstawie błędu prędkości i przyspieszenia.
 """
 
+import functools
+import hashlib
+
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
 import matplotlib.pyplot as plt
 
+try:
+    from src.core_fuzzy._fast_kernel import (
+        aggregate, centroid, centroid_weights, compile_rules, compute_throttle_fast, index_rules
+    )
+except ImportError:
+    # Uruchomienie pliku jako skryptu (python src/core_fuzzy/fuzzy_controller.py)
+    from _fast_kernel import (
+        aggregate, centroid, centroid_weights, compile_rules, compute_throttle_fast, index_rules
+    )
+
+
+# Domyślny katalog dyskowej pamięci podręcznej powierzchni sterowania
+# (używany tylko, gdy wywołujący przekaże go jawnie do plot_control_surface)
+SURFACE_CACHE_DIR = '.surface_cache'
+
+# Wersja algorytmu liczenia powierzchni - część klucza pamięci podręcznej.
+# Zwiększyć przy każdej zmianie compute_surface lub funkcji z _fast_kernel,
+# z których korzysta, żeby wpisy zapisane przez starszy kod nie były zwracane.
+SURFACE_CACHE_VERSION = 2
+
+
+def _surface_for_key(cache_key, x, y, controller):
+    """Powierzchnia sterowania dla (klucz konfiguracji, siatka)."""
+    return controller.compute_surface(x, y)
+
+
+@functools.lru_cache(maxsize=None)
+def _surface_cache(cache_dir):
+    """Wersja `_surface_for_key` z pamięcią joblib w `cache_dir` (tworzona przy pierwszym użyciu)."""
+    # joblib potrzebny tylko dla pamięci dyskowej - import dopiero przy pierwszym użyciu
+    from joblib import Memory
+    return Memory(cache_dir, verbose=0).cache(_surface_for_key, ignore=['controller'])
+
 
 class FuzzyThrottleController:
     """
@@ -23,12 +59,28 @@ class FuzzyThrottleController:
         - throttle: wartość przepustnicy [0, 100]
     """
     
+    # Pamięć podręczna compute_throttle: maksymalna liczba wpisów i dokładność klucza
+    CACHE_SIZE = 4096
+    CACHE_DECIMALS = 2
+    
+    # Liczba unikalnych obliczeń, po których symulator skfuzzy czyści swoje wyniki
+    SIMULATOR_FLUSH_AFTER_RUN = 10_000
+    
+    # Liczba wierszy siatki przetwarzanych naraz w compute_surface
+    SURFACE_BLOCK_ROWS = 64
+    
     def __init__(self):
         """Inicjalizacja kontrolera - definiuje zmienne i reguły."""
         self._define_fuzzy_variables()
         self._define_membership_functions()
+        self._build_mf_tables()
         self._define_rules()
         self._create_control_system()
+        self._prepare_fast_path()
+        
+        # Figura funkcji przynależności (tworzona leniwie w plot_memberships)
+        self._mem_fig = None
+        self._mem_lines = {}
     
     def _define_fuzzy_variables(self):
         """Definicja zmiennych lingwistycznych."""
@@ -83,71 +135,139 @@ class FuzzyThrottleController:
             self.throttle.universe, [80, 90, 100, 100]
         )
     
-    def _define_rules(self):
-        """Definicja reguł wnioskowania rozmytego (IF-THEN)."""
-        self.rules = [
-            # Gdy jesteśmy za szybko (negative error) - redukuj moc
-            ctrl.Rule(
-                self.speed_error['negative_large'],
-                self.throttle['very_low']
-            ),
-            ctrl.Rule(
-                self.speed_error['negative_small'] & self.acceleration['negative'],
-                self.throttle['very_low']
-            ),
-            ctrl.Rule(
-                self.speed_error['negative_small'] & self.acceleration['zero'],
-                self.throttle['low']
-            ),
-            ctrl.Rule(
-                self.speed_error['negative_small'] & self.acceleration['positive'],
-                self.throttle['medium']
-            ),
-            
-            # Gdy prędkość jest OK - utrzymuj
-            ctrl.Rule(
-                self.speed_error['zero'] & self.acceleration['negative'],
-                self.throttle['low']
-            ),
-            ctrl.Rule(
-                self.speed_error['zero'] & self.acceleration['zero'],
-                self.throttle['medium']
-            ),
-            ctrl.Rule(
-                self.speed_error['zero'] & self.acceleration['positive'],
-                self.throttle['medium']
-            ),
+    def _build_mf_tables(self):
+        """Zapisuje funkcje przynależności jako tablice NumPy (uniwersum + MF per term)."""
+        # Wyniki policzone na poprzednich tablicach są nieaktualne
+        self._throttle_cache = {}
+        self._universes = {}
+        self._mf_tables = {}
+        self._uniform_grids = {}
+        for var in (self.speed_error, self.acceleration, self.throttle):
+            universe = var.universe.astype(float)
+            self._universes[var.label] = universe
+            self._mf_tables[var.label] = {
+                term: np.asarray(mf.mf, dtype=float) for term, mf in var.terms.items()
+            }
             
-            # Gdy jesteśmy za wolno (positive error) - zwiększ moc
-            ctrl.Rule(
-                self.speed_error['positive_small'] & self.acceleration['negative'],
-                self.throttle['medium']
-            ),
-            ctrl.Rule(
-                self.speed_error['positive_small'] & self.acceleration['zero'],
-                self.throttle['high']
-            ),
-            ctrl.Rule(
-                self.speed_error['positive_small'] & self.acceleration['positive'],
-                self.throttle['medium']
-            ),
-            
-            # Duży błąd pozytywny - maksymalne przyspieszenie
-            ctrl.Rule(
-                self.speed_error['positive_large'] & self.acceleration['negative'],
-                self.throttle['very_high']
-            ),
-            ctrl.Rule(
-                self.speed_error['positive_large'] & 
-                (self.acceleration['zero'] | self.acceleration['positive']),
-                self.throttle['very_high']
-            ),
-        ]
+            # Uniwersum o stałym kroku: indeks punktu wyznaczany bez wyszukiwania
+            steps = np.diff(universe)
+            if steps.size and np.allclose(steps, steps[0]):
+                self._uniform_grids[var.label] = (
+                    universe[0], 1.0 / steps[0], universe.size - 2,
+                    [mf.tolist() for mf in self._mf_tables[var.label].values()],
+                )
+    
+    def _fuzzify(self, var_label, crisp):
+        """
+        Fuzyfikacja wartości ostrej (lub tablicy) przez interpolację tablic MF.
+        
+        Dla skalarów na uniwersum o stałym kroku indeks wyznaczany jest
+        bezpośrednio (x - x0) / krok, zamiast wyszukiwania binarnego.
+        
+        Returns:
+            lista stopni przynależności w kolejności definicji termów
+        """
+        grid = self._uniform_grids.get(var_label)
+        if grid is None or isinstance(crisp, np.ndarray):
+            universe = self._universes[var_label]
+            return [np.interp(crisp, universe, mf) for mf in self._mf_tables[var_label].values()]
+        
+        start, inv_step, last_idx, rows = grid
+        position = (crisp - start) * inv_step
+        idx = min(max(int(position), 0), last_idx)
+        frac = position - idx
+        return [row[idx] + (row[idx + 1] - row[idx]) * frac for row in rows]
+    
+    # Baza reguł w postaci danych: (termy speed_error, termy acceleration, term throttle).
+    # Kilka termów w krotce łączonych jest przez OR, None oznacza brak warunku.
+    RULE_TABLE = (
+        # Gdy jesteśmy za szybko (negative error) - redukuj moc
+        (('negative_large',), None, 'very_low'),
+        (('negative_small',), ('negative',), 'very_low'),
+        (('negative_small',), ('zero',), 'low'),
+        (('negative_small',), ('positive',), 'medium'),
+        
+        # Gdy prędkość jest OK - utrzymuj
+        (('zero',), ('negative',), 'low'),
+        (('zero',), ('zero',), 'medium'),
+        (('zero',), ('positive',), 'medium'),
+        
+        # Gdy jesteśmy za wolno (positive error) - zwiększ moc
+        (('positive_small',), ('negative',), 'medium'),
+        (('positive_small',), ('zero',), 'high'),
+        (('positive_small',), ('positive',), 'medium'),
+        
+        # Duży błąd pozytywny - maksymalne przyspieszenie
+        (('positive_large',), ('negative',), 'very_high'),
+        (('positive_large',), ('zero', 'positive'), 'very_high'),
+    )
+    
+    def _define_rules(self):
+        """Definicja reguł wnioskowania rozmytego (IF-THEN) na podstawie RULE_TABLE."""
+        self.rules = []
+        for err_terms, acc_terms, out_term in self.RULE_TABLE:
+            antecedent = self._join_terms(self.speed_error, err_terms)
+            if acc_terms is not None:
+                antecedent = antecedent & self._join_terms(self.acceleration, acc_terms)
+            self.rules.append(ctrl.Rule(antecedent, self.throttle[out_term]))
+    
+    @staticmethod
+    def _join_terms(variable, terms):
+        """Łączy termy zmiennej lingwistycznej operatorem OR."""
+        antecedent = variable[terms[0]]
+        for term in terms[1:]:
+            antecedent = antecedent | variable[term]
+        return antecedent
     
     def _create_control_system(self):
         """Utworzenie systemu sterowania i symulatora."""
         self.control_system = ctrl.ControlSystem(self.rules)
-        self.simulator = ctrl.ControlSystemSimulation(self.control_system)
+        self.simulator = ctrl.ControlSystemSimulation(
+            self.control_system, flush_after_run=self.SIMULATOR_FLUSH_AFTER_RUN
+        )
+    
+    def _prepare_fast_path(self):
+        """Przygotowanie danych dla szybkiej ścieżki wnioskowania (_fast_kernel)."""
+        self._err_terms = list(self.speed_error.terms)
+        self._acc_terms = list(self.acceleration.terms)
+        self._out_terms = list(self.throttle.terms)
+        self._fast_rules = compile_rules(
+            self.RULE_TABLE, self._err_terms, self._acc_terms, self._out_terms
+        )
+        self._rule_index = index_rules(
+            self._fast_rules, len(self._err_terms), len(self._acc_terms)
+        )
+        self._consequent_mfs = np.array(list(self._mf_tables['throttle'].values()))
+        
+        # Uniwersum wyjścia jest stałe - wagi centroidu liczone raz
+        self._centroid_w = centroid_weights(self._universes['throttle'])
+        
+        # Bufor roboczy agregacji compute_throttle (agregat + przycięty term)
+        self._aggregate_buf = np.empty((2, self._consequent_mfs.shape[1]))
+        
+        # Kopie float32 dla ścieżki wsadowej - tensor (y, x, uniwersum) zajmuje połowę pamięci
+        self._centroid_w_f32 = np.ascontiguousarray(self._centroid_w, dtype=np.float32)
+        self._consequent_mfs_f32 = np.ascontiguousarray(self._consequent_mfs, dtype=np.float32)
+        
+        # Nowe reguły/konsekwenty - wyniki z pamięci podręcznej są nieaktualne
+        self._throttle_cache.clear()
+    
+    def _compute_config_hash(self):
+        """
+        Stabilny skrót wersji algorytmu, bazy reguł i funkcji przynależności.
+        
+        Liczony przy każdym użyciu z tablic, z których czyta compute_surface,
+        więc zmiana MF po utworzeniu kontrolera daje nowy klucz.
+        """
+        digest = hashlib.sha256(f"v{SURFACE_CACHE_VERSION}".encode())
+        digest.update(repr(self.RULE_TABLE).encode())
+        for label, tables in self._mf_tables.items():
+            digest.update(label.encode())
+            digest.update(self._universes[label].tobytes())
+            for term, mf in tables.items():
+                digest.update(term.encode())
+                digest.update(mf.tobytes())
+        return digest.hexdigest()
     
     def compute_throttle(self, speed_error: float, acceleration: float) -> float:
         """
@@ -161,61 +281,140 @@ class FuzzyThrottleController:
             throttle: wartość przepustnicy [0, 100]
         """
         # Ograniczenie wartości wejściowych do zdefiniowanych zakresów
-        speed_error = np.clip(speed_error, -30, 30)
-        acceleration = np.clip(acceleration, -10, 10)
+        # (min/max na floatach zamiast np.clip - bez narzutu NumPy dla skalarów)
+        speed_error = min(30.0, max(-30.0, float(speed_error)))
+        acceleration = min(10.0, max(-10.0, float(acceleration)))
+        
+        # Pamięć podręczna wyników dla zaokrąglonych wejść
+        key = (round(speed_error, self.CACHE_DECIMALS),
+               round(acceleration, self.CACHE_DECIMALS))
+        throttle = self._throttle_cache.get(key)
+        if throttle is not None:
+            return throttle
+        speed_error, acceleration = key
+        
+        # Fuzyfikacja wejść
+        err_mu = self._fuzzify('speed_error', speed_error)
+        acc_mu = self._fuzzify('acceleration', acceleration)
+        
+        # Wnioskowanie i defuzyfikacja (centroid) bez grafu skfuzzy
+        throttle = compute_throttle_fast(
+            err_mu, acc_mu, self._fast_rules, self._rule_index,
+            self._centroid_w, self._consequent_mfs, out=self._aggregate_buf
+        )
+        
+        # Ograniczenie rozmiaru pamięci podręcznej (FIFO - usuwamy najstarszy wpis)
+        if len(self._throttle_cache) >= self.CACHE_SIZE:
+            del self._throttle_cache[next(iter(self._throttle_cache))]
+        self._throttle_cache[key] = throttle
+        
+        return throttle
+    
+    def compute_surface(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Oblicza throttle dla całej siatki (acceleration x speed_error) naraz.
+        
+        Odtwarza wnioskowanie Mamdaniego ze skfuzzy (AND = min, OR = max,
+        implikacja = min, agregacja = max, defuzyfikacja centroidem) w NumPy,
+        bez wywoływania `compute()` symulatora dla każdego punktu siatki.
         
-        # Ustawienie wejść
-        self.simulator.input['speed_error'] = speed_error
-        self.simulator.input['acceleration'] = acceleration
+        Args:
+            x: wartości speed_error (1-D)
+            y: wartości acceleration (1-D)
+        
+        Returns:
+            Z: macierz throttle (float32) o kształcie (len(y), len(x))
+        """
+        x = np.clip(np.asarray(x, dtype=float), -30, 30)
+        y = np.clip(np.asarray(y, dtype=float), -10, 10)
+        
+        # Fuzyfikacja siatek 1-D dla każdego termu (dalsze obliczenia we float32)
+        mu_err = np.asarray(self._fuzzify('speed_error', x), dtype=np.float32)
+        mu_acc = np.asarray(self._fuzzify('acceleration', y), dtype=np.float32)
         
-        # Wnioskowanie i defuzyfikacja (centroid)
-        self.simulator.compute()
+        # Siła odpalenia reguł (min) akumulowana per term wyjściowy (max)
+        cuts = np.zeros((len(self._out_terms), y.size, x.size), dtype=np.float32)
+        for err_idx, acc_idx, out_idx in self._fast_rules:
+            err_degree = np.max([mu_err[i] for i in err_idx], axis=0)
+            if acc_idx is None:
+                acc_degree = np.ones(y.size, dtype=np.float32)
+            else:
+                acc_degree = np.max([mu_acc[i] for i in acc_idx], axis=0)
+            np.maximum(cuts[out_idx], np.minimum.outer(acc_degree, err_degree),
+                       out=cuts[out_idx])
         
-        return float(self.simulator.output['throttle'])
+        # Przycięcie konsekwentów, agregacja (max) i defuzyfikacja - blokami wierszy,
+        # żeby tensor (wiersze, x, uniwersum) nie rósł z rozmiarem siatki
+        Z = np.empty((y.size, x.size), dtype=np.float32)
+        for start in range(0, y.size, self.SURFACE_BLOCK_ROWS):
+            rows = slice(start, start + self.SURFACE_BLOCK_ROWS)
+            Z[rows] = centroid(self._centroid_w_f32,
+                               aggregate(cuts[:, rows], self._consequent_mfs_f32))
+        return Z
+    
+    # Opisy wykresów funkcji przynależności: (zmienna, tytuł, etykieta osi X)
+    MEMBERSHIP_PLOTS = (
+        ('speed_error', 'Funkcje przynależności: Speed Error', 'Speed Error [km/h]'),
+        ('acceleration', 'Funkcje przynależności: Acceleration', 'Acceleration [m/s²]'),
+        ('throttle', 'Funkcje przynależności: Throttle', 'Throttle [%]'),
+    )
     
     def plot_memberships(self):
-        """Wizualizacja funkcji przynależności dla wszystkich zmiennych."""
-        fig, axes = plt.subplots(3, 1, figsize=(12, 10))
-        
-        # Speed Error
-        self.speed_error.view(ax=axes[0])
-        axes[0].set_title('Funkcje przynależności: Speed Error', fontsize=14, fontweight='bold')
-        axes[0].set_xlabel('Speed Error [km/h]')
-        axes[0].set_ylabel('Stopień przynależności')
-        axes[0].grid(True, alpha=0.3)
-        axes[0].legend(loc='upper right', fontsize=9)
-        
-        # Acceleration
-        self.acceleration.view(ax=axes[1])
-        axes[1].set_title('Funkcje przynależności: Acceleration', fontsize=14, fontweight='bold')
-        axes[1].set_xlabel('Acceleration [m/s²]')
-        axes[1].set_ylabel('Stopień przynależności')
-        axes[1].grid(True, alpha=0.3)
-        axes[1].legend(loc='upper right', fontsize=9)
-        
-        # Throttle
-        self.throttle.view(ax=axes[2])
-        axes[2].set_title('Funkcje przynależności: Throttle', fontsize=14, fontweight='bold')
-        axes[2].set_xlabel('Throttle [%]')
-        axes[2].set_ylabel('Stopień przynależności')
-        axes[2].grid(True, alpha=0.3)
-        axes[2].legend(loc='upper right', fontsize=9)
+        """
+        Wizualizacja funkcji przynależności dla wszystkich zmiennych.
+        
+        Figura i linie tworzone są przy pierwszym wywołaniu; kolejne wywołania
+        tylko podmieniają dane istniejących linii zamiast budować wykres od nowa.
+        """
+        if self._mem_fig is None or not plt.fignum_exists(self._mem_fig.number):
+            self._create_membership_figure()
+        else:
+            for label, lines in self._mem_lines.items():
+                variable = getattr(self, label)
+                for term, line in lines.items():
+                    line.set_data(variable.universe, variable[term].mf)
+            self._mem_fig.canvas.draw_idle()
         
-        plt.tight_layout()
         plt.show()
     
-    def plot_control_surface(self):
-        """Wizualizacja powierzchni sterowania (throttle vs speed_error vs acceleration)."""
+    def _create_membership_figure(self):
+        """Tworzy figurę z funkcjami przynależności i zapamiętuje linie termów."""
+        self._mem_fig, axes = plt.subplots(3, 1, figsize=(12, 10))
+        self._mem_lines = {}
+        
+        for ax, (label, title, xlabel) in zip(axes, self.MEMBERSHIP_PLOTS):
+            variable = getattr(self, label)
+            self._mem_lines[label] = {
+                term: ax.plot(variable.universe, mf.mf, linewidth=1.5, label=term)[0]
+                for term, mf in variable.terms.items()
+            }
+            ax.set_title(title, fontsize=14, fontweight='bold')
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel('Stopień przynależności')
+            ax.grid(True, alpha=0.3)
+            ax.legend(loc='upper right', fontsize=9)
+        
+        self._mem_fig.tight_layout()
+    
+    def plot_control_surface(self, cache_dir=None):
+        """
+        Wizualizacja powierzchni sterowania (throttle vs speed_error vs acceleration).
+        
+        Args:
+            cache_dir: katalog dyskowej pamięci podręcznej powierzchni
+                (np. SURFACE_CACHE_DIR); None wyłącza zapis na dysk
+        """
         # Generowanie siatki punktów
         x = np.arange(-30, 31, 2)
         y = np.arange(-10, 11, 1)
-        X, Y = np.meshgrid(x, y)
-        Z = np.zeros_like(X, dtype=float)
+        X, Y = np.meshgrid(x, y, sparse=True)
         
-        # Obliczenie throttle dla każdego punktu
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                Z[i, j] = self.compute_throttle(X[i, j], Y[i, j])
+        # Obliczenie throttle dla całej siatki jednym przebiegiem
+        # (z pamięcią dyskową - przeliczane tylko po zmianie wersji/reguł/MF)
+        if cache_dir is None:
+            Z = self.compute_surface(x, y)
+        else:
+            Z = _surface_cache(cache_dir)(self._compute_config_hash(), x, y, controller=self)
         
         # Wizualizacja 3D
         fig = plt.figure(figsize=(14, 6))
@@ -231,7 +430,7 @@ class FuzzyThrottleController:
         
         # Contour plot
         ax2 = fig.add_subplot(122)
-        contour = ax2.contourf(X, Y, Z, levels=15, cmap='viridis')
+        contour = ax2.contourf(x, y, Z, levels=15, cmap='viridis')
         ax2.set_xlabel('Speed Error [km/h]')
         ax2.set_ylabel('Acceleration [m/s²]')
         ax2.set_title('Mapa konturowa sterowania', fontweight='bold')
@@ -337,7 +536,7 @@ if __name__ == "__main__":
     
     # Wizualizacja powierzchni sterowania
     print("\nGenerowanie powierzchni sterowania...")
-    controller.plot_control_surface()
+    controller.plot_control_surface(cache_dir=SURFACE_CACHE_DIR)
     
     print("\n" + "=" * 70)
     print(" SYMULACJA ZAKOŃCZONA")
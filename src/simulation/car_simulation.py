@@ -3,9 +3,135 @@ Moduł symulacji fizyki pojazdu dla fuzzy kontrolera.
 Model dynamiki pojazdu w czasie dyskretnym.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+import math
+
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+
+@dataclass
+class HistorySoA:
+    """
+    Historia symulacji w układzie SoA - osobna tablica float64 na każde pole.
+    
+    Dostęp `history['speed']` zwraca widok zapisanych próbek (bez kopii).
+    Bufory rosną dwukrotnie, gdy brakuje miejsca.
+    """
+    
+    FIELDS = ('time', 'position', 'speed', 'acceleration', 'throttle')
+    
+    capacity: int = 1024
+    length: int = 0
+    arrays: Dict[str, np.ndarray] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.arrays = {key: np.empty(self.capacity) for key in self.FIELDS}
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.arrays[key][:self.length]
+    
+    def _reserve(self, needed: int) -> None:
+        """Zapewnia miejsce na `needed` próbek (podwajanie pojemności)."""
+        if needed <= self.capacity:
+            return
+        while self.capacity < needed:
+            self.capacity *= 2
+        for key in self.FIELDS:
+            self.arrays[key] = np.resize(self.arrays[key], self.capacity)
+    
+    def append(self, time, position, speed, acceleration, throttle) -> None:
+        """Dopisuje jedną próbkę."""
+        self._reserve(self.length + 1)
+        i = self.length
+        self.arrays['time'][i] = time
+        self.arrays['position'][i] = position
+        self.arrays['speed'][i] = speed
+        self.arrays['acceleration'][i] = acceleration
+        self.arrays['throttle'][i] = throttle
+        self.length += 1
+    
+    def extend(self, trajectory: Dict[str, np.ndarray]) -> None:
+        """Dopisuje całą trajektorię (tablice o wspólnej długości, jak z simulate_batch)."""
+        n = len(trajectory['time'])
+        self._reserve(self.length + n)
+        for key in self.FIELDS:
+            self.arrays[key][self.length:self.length + n] = trajectory[key]
+        self.length += n
+    
+    def clear(self) -> None:
+        """Usuwa wszystkie próbki (bufory pozostają zaalokowane)."""
+        self.length = 0
+
+
+# Poniżej tego |x| funkcje phi liczone są z szeregu - wzory z exp tracą
+# wtedy precyzję na odejmowaniu bliskich liczb
+_PHI_SERIES_LIMIT = 1e-4
+
+
+def _phi(x):
+    """
+    Funkcje phi1(x) = (1 - e^-x) / x oraz phi2(x) = (x - 1 + e^-x) / x².
+    
+    Granice dla x -> 0 (brak oporu) to phi1 = 1 i phi2 = 1/2.
+    """
+    if abs(x) < _PHI_SERIES_LIMIT:
+        return 1.0 - x / 2 + x * x / 6, 0.5 - x / 6 + x * x / 24
+    phi1 = -math.expm1(-x) / x
+    return phi1, (1.0 - phi1) / x
+
+
+def _phi1_array(x):
+    """phi1 z `_phi` dla tablicy argumentów."""
+    x = np.asarray(x, dtype=float)
+    out = np.empty_like(x)
+    small = np.abs(x) < _PHI_SERIES_LIMIT
+    xs = x[small]
+    out[small] = 1.0 - xs / 2 + xs * xs / 6
+    xl = x[~small]
+    out[~small] = -np.expm1(-xl) / xl
+    return out
+
+
+def _update_step(position, speed, throttle, mass, drag_coeff, max_throttle, dt):
+    """
+    Jeden krok symulacji na skalarach (bez obiektów NumPy).
+    
+    Przy stałym throttle równanie v' = (F - c·v) / m jest liniowe, więc krok
+    liczony jest dokładnie: prędkość zbiega wykładniczo do v_inf = F / c
+    ze stałą czasową tau = m / c. Z x = dt / tau i przyspieszeniem a na
+    początku kroku:
+        speed    += a·dt·phi1(x)
+        position += speed·dt + a·dt²·phi2(x)
+    Rozwiązanie jest stabilne dla dowolnego dt i nie schodzi poniżej zera
+    dla F >= 0, więc nie wymaga obcinania. Dla c = 0 (phi1 = 1, phi2 = 1/2)
+    przechodzi w ruch jednostajnie przyspieszony, bez dzielenia przez c.
+    
+    Returns:
+        (position, speed, acceleration, throttle) po kroku
+    """
+    # Ograniczenie throttle do zakresu [0, 100]
+    throttle = min(100.0, max(0.0, throttle))
+    
+    # Siła napędowa minus siła oporu (przyspieszenie na początku kroku)
+    throttle_force = (throttle / 100.0) * max_throttle
+    acceleration = (throttle_force - drag_coeff * speed) / mass
+    
+    # Dokładne całkowanie prędkości i pozycji w kroku dt
+    phi1, phi2 = _phi(drag_coeff * dt / mass)
+    position += speed * dt + acceleration * dt * dt * phi2
+    speed += acceleration * dt * phi1
+    
+    return position, speed, acceleration, throttle
 
 
 class CarSimulation:
@@ -37,26 +163,14 @@ class CarSimulation:
         self.acceleration = 0.0
         
         # Historia (dla wizualizacji)
-        self.history = {
-            'time': [],
-            'position': [],
-            'speed': [],
-            'acceleration': [],
-            'throttle': []
-        }
+        self.history = HistorySoA()
         
     def reset(self) -> None:
         """Resetuje stan pojazdu do wartości początkowych."""
         self.position = 0.0
         self.speed = 0.0
         self.acceleration = 0.0
-        self.history = {
-            'time': [],
-            'position': [],
-            'speed': [],
-            'acceleration': [],
-            'throttle': []
-        }
+        self.history.clear()
         
     def update(self, throttle: float, dt: float = None) -> Dict[str, float]:
         """
@@ -66,8 +180,10 @@ class CarSimulation:
             F_net = F_throttle - F_drag
             F_drag = drag_coeff * speed
             acceleration = F_net / mass
-            speed += acceleration * dt
-            position += speed * dt
+            speed    -> v_inf + (speed - v_inf) * exp(-dt / tau)
+            position += całka z prędkości w kroku dt
+        gdzie v_inf = F_throttle / drag_coeff, tau = mass / drag_coeff
+        (dla drag_coeff = 0 ruch jednostajnie przyspieszony, a = F_throttle / mass).
         
         Args:
             throttle: Wartość przepustnicy [0-100] (procent mocy)
@@ -79,25 +195,10 @@ class CarSimulation:
         if dt is None:
             dt = self.dt
             
-        # Ograniczenie throttle do zakresu [0, 100]
-        throttle = np.clip(throttle, 0, 100)
-        
-        # Przeliczenie throttle na siłę [N]
-        throttle_force = (throttle / 100.0) * self.max_throttle
-        
-        # Siła oporu
-        drag_force = self.drag_coeff * self.speed
-        
-        # Obliczenie przyspieszenia
-        net_force = throttle_force - drag_force
-        self.acceleration = net_force / self.mass
-        
-        # Aktualizacja prędkości (nie może być ujemna)
-        self.speed += self.acceleration * dt
-        self.speed = max(0.0, self.speed)
-        
-        # Aktualizacja pozycji
-        self.position += self.speed * dt
+        self.position, self.speed, self.acceleration, throttle = _update_step(
+            self.position, self.speed, float(throttle),
+            self.mass, self.drag_coeff, self.max_throttle, dt
+        )
         
         # Stan do zwrócenia
         state = {
@@ -109,13 +210,102 @@ class CarSimulation:
         
         return state
     
+    def update_inplace(self, throttle: float, dt: float = None) -> None:
+        """
+        Jak update, ale tylko modyfikuje stan pojazdu (bez budowania słownika).
+        
+        Przeznaczone dla gorących pętli, które czytają self.speed itd. bezpośrednio.
+        """
+        if dt is None:
+            dt = self.dt
+            
+        self.position, self.speed, self.acceleration, _ = _update_step(
+            self.position, self.speed, float(throttle),
+            self.mass, self.drag_coeff, self.max_throttle, dt
+        )
+    
+    def simulate_batch(
+        self,
+        throttle: np.ndarray,
+        dt: float = None,
+        start_time: float = 0.0,
+        record: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        Symuluje całą trajektorię dla zadanego profilu throttle (krok po kroku
+        jak w update), bez pętli Pythona po krokach czasowych.
+        
+        Równanie prędkości jest liniowe, więc dla odcinka o stałym throttle
+        prędkość po k krokach ma postać zamkniętą:
+            v[k] = v[0] + a0 * k*dt * phi1(k*x),  x = dt * drag_coeff / mass
+        gdzie a0 to przyspieszenie na początku odcinka (patrz `_update_step`,
+        także dla drag_coeff = 0). Profil dzielony jest na odcinki stałego
+        throttle i każdy liczony jest jedną operacją na tablicach.
+        
+        Args:
+            throttle: Profil przepustnicy [0-100], jedna wartość na krok
+            dt: Krok czasowy [s], jeśli None używa self.dt
+            start_time: Czas pierwszego kroku [s] (dla historii)
+            record: Czy dopisać trajektorię do historii
+            
+        Returns:
+            dict: Tablice 'time', 'position', 'speed', 'acceleration', 'throttle'
+        """
+        if dt is None:
+            dt = self.dt
+            
+        throttle = np.clip(np.asarray(throttle, dtype=float), 0, 100)
+        n_steps = throttle.size
+        time = start_time + np.arange(n_steps) * dt
+        
+        if n_steps == 0:
+            empty = np.empty(0)
+            return {'time': time, 'position': empty, 'speed': empty.copy(),
+                    'acceleration': empty.copy(), 'throttle': throttle}
+        
+        throttle_force = (throttle / 100.0) * self.max_throttle
+        x = self.drag_coeff * dt / self.mass
+        _, phi2 = _phi(x)
+        
+        # Początki odcinków o stałym throttle
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(throttle)) + 1, [n_steps]))
+        
+        speed = np.empty(n_steps)
+        v0 = self.speed
+        for begin, end in zip(starts[:-1], starts[1:]):
+            # Po k krokach: v[k] - v[0] = a0·(k·dt)·phi1(k·x)
+            k = np.arange(1, end - begin + 1)
+            a0 = (throttle_force[begin] - self.drag_coeff * v0) / self.mass
+            speed[begin:end] = v0 + a0 * (k * dt) * _phi1_array(k * x)
+            v0 = speed[end - 1]
+        
+        previous_speed = np.concatenate(([self.speed], speed[:-1]))
+        acceleration = (throttle_force - self.drag_coeff * previous_speed) / self.mass
+        
+        # Droga w każdym kroku to całka z wykładniczego przebiegu prędkości
+        step_distance = previous_speed * dt + acceleration * (dt * dt * phi2)
+        position = self.position + np.cumsum(step_distance)
+        
+        self.position = float(position[-1])
+        self.speed = float(speed[-1])
+        self.acceleration = float(acceleration[-1])
+        
+        trajectory = {
+            'time': time,
+            'position': position,
+            'speed': speed,
+            'acceleration': acceleration,
+            'throttle': throttle
+        }
+        
+        if record:
+            self.history.extend(trajectory)
+        
+        return trajectory
+    
     def record_state(self, time: float, throttle: float) -> None:
         """Zapisuje aktualny stan do historii."""
-        self.history['time'].append(time)
-        self.history['position'].append(self.position)
-        self.history['speed'].append(self.speed)
-        self.history['acceleration'].append(self.acceleration)
-        self.history['throttle'].append(throttle)
+        self.history.append(time, self.position, self.speed, self.acceleration, throttle)
         
     def get_state(self) -> Dict[str, float]:
         """Zwraca aktualny stan pojazdu."""
@@ -127,7 +317,7 @@ class CarSimulation:
         
     def plot_results(self, title: str = "Symulacja pojazdu") -> None:
         """Wizualizuje wyniki symulacji."""
-        if not self.history['time']:
+        if not len(self.history):
             print("Brak danych do wizualizacji. Uruchom symulację.")
             return
             
@@ -165,6 +355,54 @@ class CarSimulation:
         plt.show()
 
 
+def run_rollout(
+    params: Dict[str, float],
+    throttle_schedule,
+    duration: float
+) -> Dict[str, np.ndarray]:
+    """
+    Pojedyncza, niezależna symulacja dla zadanych parametrów pojazdu.
+    
+    Args:
+        params: Argumenty konstruktora CarSimulation (mass, drag_coeff, ...)
+        throttle_schedule: Stały throttle lub profil o długości liczby kroków
+        duration: Czas symulacji [s]
+        
+    Returns:
+        dict: Trajektoria jak w CarSimulation.simulate_batch
+    """
+    car = CarSimulation(**params)
+    n_steps = int(round(duration / car.dt)) + 1
+    throttle = np.broadcast_to(np.asarray(throttle_schedule, dtype=float), (n_steps,))
+    return car.simulate_batch(throttle, record=False)
+
+
+def run_rollouts(
+    param_sets: Iterable[Dict[str, float]],
+    throttle_schedule,
+    duration: float,
+    max_workers: int = None
+) -> List[Dict[str, np.ndarray]]:
+    """
+    Równoległe symulacje dla wielu zestawów parametrów (przegląd parametrów).
+    
+    Każdy proces liczy całą trajektorię i odsyła tylko tablice wyników.
+    Używane są procesy, nie wątki - symulacja nie zwalnia GIL.
+    
+    Args:
+        param_sets: Zestawy argumentów konstruktora CarSimulation
+        throttle_schedule: Stały throttle lub profil (wspólny dla wszystkich)
+        duration: Czas symulacji [s]
+        max_workers: Liczba procesów (domyślnie liczba rdzeni)
+        
+    Returns:
+        list: Trajektorie w kolejności param_sets
+    """
+    rollout = partial(run_rollout, throttle_schedule=throttle_schedule, duration=duration)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(rollout, param_sets))
+
+
 def test_constant_throttle(throttle_value: float = 50.0, duration: float = 20.0):
     """
     Test symulacji ze stałym throttle.
@@ -193,11 +431,8 @@ def test_constant_throttle(throttle_value: float = 50.0, duration: float = 20.0)
     print(f"\nRozpoczynanie symulacji na {duration} sekund...\n")
     
     # Symulacja
-    current_time = 0.0
-    while current_time <= duration:
-        state = car.update(throttle_value)
-        car.record_state(current_time, throttle_value)
-        current_time += car.dt
+    n_steps = int(round(duration / car.dt)) + 1
+    car.simulate_batch(np.full(n_steps, throttle_value))
     
     # Wyniki końcowe
     final_state = car.get_state()
@@ -225,21 +460,17 @@ def test_variable_throttle():
     
     car = CarSimulation(mass=1000.0, drag_coeff=50.0, max_throttle=5000.0, dt=0.1)
     
-    current_time = 0.0
     duration = 30.0
+    time = np.arange(int(round(duration / car.dt)) + 1) * car.dt
     
-    while current_time <= duration:
-        # Profil throttle: przyspieszanie → utrzymanie → hamowanie
-        if current_time < 10.0:
-            throttle = 80.0  # Przyspieszanie
-        elif current_time < 20.0:
-            throttle = 40.0  # Utrzymanie prędkości
-        else:
-            throttle = 10.0  # Hamowanie
-            
-        state = car.update(throttle)
-        car.record_state(current_time, throttle)
-        current_time += car.dt
+    # Profil throttle: przyspieszanie → utrzymanie → hamowanie
+    throttle = np.select(
+        [time < 10.0, time < 20.0],
+        [80.0, 40.0],   # Przyspieszanie, utrzymanie prędkości
+        default=10.0    # Hamowanie
+    )
+    
+    car.simulate_batch(throttle)
     
     car.plot_results("Test symulacji: Zmienny throttle")
     
@@ -8,6 +8,7 @@ Używa PyQtGraph dla wysokiej wydajności renderowania w czasie rzeczywistym.
 """
 
 import sys
+import math
 import numpy as np
 from PyQt5 import QtWidgets, QtCore, QtGui
 import pyqtgraph as pg
@@ -19,6 +20,20 @@ from src.core_fuzzy.fuzzy_controller import FuzzyThrottleController
 class OvalTrack:
     """Definicja toru owalnego z obliczaniem pozycji i prędkości docelowej."""
     
+    # Stały zestaw atrybutów - dostęp przez sloty zamiast słownika instancji
+    __slots__ = ('width', 'height', 'a', 'b', 'perimeter', 'inv_perimeter',
+                 'track_x', 'track_y', 'inner_x', 'inner_y',
+                 '_positions', '_inv_step')
+    
+    # Okrąg jednostkowy do rysowania toru - wspólny dla wszystkich rozmiarów
+    # (float32 wystarcza do rysowania, a pyqtgraph i tak konwertuje dane)
+    _THETA = np.linspace(0, 2*np.pi, 200)
+    _COS = np.cos(_THETA).astype(np.float32)
+    _SIN = np.sin(_THETA).astype(np.float32)
+    
+    # Krok tablicy pozycji [m] - dużo poniżej rozdzielczości rysowania toru
+    POSITION_STEP = 0.1
+    
     def __init__(self, width=100, height=60):
         """
         Args:
@@ -30,48 +45,109 @@ class OvalTrack:
         self.a = width / 2
         self.b = height / 2
         
+        # Obwód owalu (przybliżenie Ramanujana) - stały dla danego toru
+        h = ((self.a - self.b)**2) / ((self.a + self.b)**2)
+        self.perimeter = math.pi * (self.a + self.b) * (1 + (3*h)/(10 + math.sqrt(4 - 3*h)))
+        self.inv_perimeter = 2 * math.pi / self.perimeter
+        
         # Pre-kalkulacja punktów toru dla wydajności
         self._cache_track_points()
+        self._cache_positions()
         
     def _cache_track_points(self):
         """Pre-kalkuluje punkty toru dla szybszego rysowania."""
-        theta = np.linspace(0, 2*np.pi, 200)
-        self.track_x = self.a * np.cos(theta)
-        self.track_y = self.b * np.sin(theta)
+        self.track_x = np.float32(self.a) * self._COS
+        self.track_y = np.float32(self.b) * self._SIN
         
         # Tor wewnętrzny
-        self.inner_x = (self.a - 5) * np.cos(theta)
-        self.inner_y = (self.b - 5) * np.sin(theta)
+        self.inner_x = np.float32(self.a - 5) * self._COS
+        self.inner_y = np.float32(self.b - 5) * self._SIN
+        
+    def _cache_positions(self):
+        """
+        Pre-kalkuluje tablicę (x, y, tx, ty) co POSITION_STEP metrów obwodu.
+        
+        Kąt parametru t nie jest proporcjonalny do drogi na elipsie, więc
+        próbki rozkładane są po długości łuku: s(t) całkowane metodą trapezów
+        na gęstej siatce, a następnie odwracane interpolacją.
+        """
+        self._inv_step = 1.0 / self.POSITION_STEP
+        # +1 slot: (distance % perimeter) * inv_step nigdy nie przekroczy n - 1
+        n = int(self.perimeter * self._inv_step) + 1
+        
+        # Długość łuku s(t) = ∫ |r'(t)| dt na gęstej siatce parametru
+        t_fine = np.linspace(0, 2*np.pi, 20 * n + 1)
+        speed = np.hypot(self.a * np.sin(t_fine), self.b * np.cos(t_fine))
+        arc = np.zeros_like(t_fine)
+        np.cumsum(0.5 * (speed[1:] + speed[:-1]) * np.diff(t_fine), out=arc[1:])
+        
+        # Odwrócenie s -> t; skala arc[-1]/perimeter dopasowuje pełne okrążenie
+        # do obwodu używanego przy zawijaniu dystansu
+        s_query = np.arange(n) * (self.POSITION_STEP * arc[-1] / self.perimeter)
+        t = np.interp(s_query, arc, t_fine)
+        
+        # Parametryzacja elipsy i znormalizowana pochodna (styczna do toru)
+        cos_t = np.cos(t)
+        sin_t = np.sin(t)
+        tx = -self.a * sin_t
+        ty = self.b * cos_t
+        norm = np.hypot(tx, ty)
+        
+        # Lista krotek Pythona - jedno indeksowanie zwraca gotowe floaty,
+        # bez opakowywania skalarów NumPy przy każdym wywołaniu
+        self._positions = list(zip(
+            (self.a * cos_t).tolist(), (self.b * sin_t).tolist(),
+            (tx / norm).tolist(), (ty / norm).tolist(),
+        ))
         
     def get_position(self, distance):
         """
-        Oblicza pozycję (x, y) na torze dla danej przebytej odległości.
+        Zwraca pozycję (x, y) na torze dla danej przebytej odległości.
         
         Args:
             distance: dystans przebytej drogi [m]
         Returns:
-            (x, y, angle): pozycja i kąt pojazdu
+            (x, y, tx, ty): pozycja i jednostkowy wektor kierunku jazdy
         """
-        # Obwód owalu (przybliżenie Ramanujana)
-        h = ((self.a - self.b)**2) / ((self.a + self.b)**2)
-        perimeter = np.pi * (self.a + self.b) * (1 + (3*h)/(10 + np.sqrt(4 - 3*h)))
-        
-        # Normalizacja dystansu do [0, 1]
-        t = (distance % perimeter) / perimeter * 2 * np.pi
-        
-        # Parametryzacja elipsy
-        x = self.a * np.cos(t)
-        y = self.b * np.sin(t)
-        
-        # Kąt pojazdu (styczna do toru)
-        angle = np.arctan2(-self.a * np.sin(t), self.b * np.cos(t))
-        
-        return x, y, angle
+        # distance % perimeter < perimeter, więc indeks mieści się w tablicy
+        return self._positions[int((distance % self.perimeter) * self._inv_step)]
 
 
 class FuzzyCarUI(QtWidgets.QMainWindow):
     """Główna klasa UI z PyQtGraph - wysoka wydajność renderowania."""
     
+    # Pióra i pędzle tworzone raz dla wszystkich okien
+    PEN_TRACK = pg.mkPen('k', width=3)
+    PEN_TRACK_INNER = pg.mkPen('k', width=1, style=QtCore.Qt.DashLine)
+    PEN_NONE = pg.mkPen(None)
+    BRUSH_CAR = pg.mkBrush('r')
+    PEN_ARROW = pg.mkPen('r', width=3)
+    PEN_TRAIL = pg.mkPen('b', width=2, style=QtCore.Qt.DotLine)
+    PEN_SPEED = pg.mkPen('b', width=2)
+    PEN_TARGET = pg.mkPen('g', width=2, style=QtCore.Qt.DashLine)
+    PEN_THROTTLE = pg.mkPen('r', width=2)
+    
+    # Style przycisków
+    STYLE_START = "QPushButton { background-color: #90EE90; font-weight: bold; padding: 10px; }"
+    STYLE_RESET = "QPushButton { background-color: #FFB6C1; font-weight: bold; padding: 10px; }"
+    STYLE_MODE_FUZZY = "QPushButton { background-color: #FFFFE0; font-weight: bold; padding: 10px; }"
+    STYLE_MODE_MANUAL = "QPushButton { background-color: #ADD8E6; font-weight: bold; padding: 10px; }"
+    
+    # Przelicznik m/s -> km/h (kontroler i pasek informacji pracują w km/h)
+    MS_TO_KMH = 3.6
+    
+    # Szablon paska informacyjnego - formatowany jednym wywołaniem
+    INFO_TEMPLATE = (
+        "⏱️ Czas: {:.1f}s  |  "
+        "📍 Przebyty dystnans: {:.1f}m  |  "
+        "🏁 Prędkość: {:.1f} m/s ({:.1f} km/h)  |  "
+        "🎯 Prędkość docelowa: {:.1f} m/s ({:.1f} km/h)  |  "
+        "⚡ Przepustnica: {:.1f}%  |  "
+        "📊 Błąd: {:.1f} km/h"
+    )
+    # Metoda związana szablonu - bez wyszukiwania atrybutu .format przy każdym wywołaniu
+    _format_info = INFO_TEMPLATE.format
+    
     def __init__(self):
         """Inicjalizacja UI i wszystkich komponentów."""
         super().__init__()
@@ -88,29 +164,49 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         self.manual_mode = False
         self.manual_throttle = 50.0
         
-        # Konfiguracja wydajności - aktualizacja wizualizacji co N kroków symulacji
-        self.sim_step_counter = 0
-        self.viz_update_interval = 1  # Aktualizuj wizualizację co 1 krok (można zwiększyć do 2-3)
-        
-        # Historia danych (ograniczona długość dla wydajności)
-        self.max_history_length = 200  # ~20s przy 10 FPS wizualizacji
+        # Konfiguracja wydajności - symulacja i wizualizacja mają osobne timery,
+        # więc koszt rysowania nie zależy od tempa symulacji
+        self.sim_interval_ms = 33   # krok symulacji co 33ms
+        self.substeps = 1           # kroków symulacji na jedno wywołanie timera
+        self.viz_interval_ms = 33   # odświeżanie wykresów ~30 FPS
+        self.info_update_interval = 6  # Pasek informacji co 6 klatek (~5 Hz wystarcza do odczytu)
+        self.frame_counter = 0
+        self.last_info_values = None  # wartości ostatnio wyświetlone w pasku informacji
+        self.last_pose = None  # (x, y, tx, ty) z ostatniego kroku symulacji
+        
+        # Historia danych - bufory cykliczne o stałym rozmiarze (okno ~20s przy dt=0.1).
+        # Bufory mają podwójną długość i każda próbka zapisywana jest dwukrotnie,
+        # więc ostatnie próbki to zawsze ciągły widok (setData bez kopiowania)
+        self.max_history_length = 200
+        self.trail_length = 50
+        # float32 wystarcza do rysowania (i oszczędza konwersji po stronie pyqtgraph)
         self.history = {
-            'time': [],
-            'speed': [],
-            'target_speed': [],
-            'throttle': [],
-            'speed_error': [],
-            'position_x': [],
-            'position_y': []
+            key: np.empty(2 * self.max_history_length, dtype=np.float32)
+            for key in ('time', 'speed', 'target_speed', 'throttle',
+                        'speed_error', 'position_x', 'position_y')
         }
+        self.history_head = 0   # indeks następnego zapisu
+        self.history_count = 0  # liczba zapisanych próbek
+        self.drawn_history = None  # (head, count) ostatnio narysowanych krzywych
+        
+        # Ślad pojazdu - bufor (x, y) o podwójnej długości: każda próbka zapisywana
+        # jest dwukrotnie, więc ostatnie trail_length punktów to zawsze ciągły widok
+        self.trail = np.zeros((2, 2 * self.trail_length), dtype=np.float32)
+        self.trail_head = 0
+        self.trail_count = 0
         
         # Tworzenie interfejsu
         self._init_ui()
         
-        # Timer symulacji (33ms = ~30 FPS)
+        # Timer symulacji
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self._simulation_step)
-        self.timer.setInterval(33)
+        self.timer.setInterval(self.sim_interval_ms * self.substeps)
+        
+        # Timer wizualizacji
+        self.viz_timer = QtCore.QTimer()
+        self.viz_timer.timeout.connect(self._visualization_frame)
+        self.viz_timer.setInterval(self.viz_interval_ms)
         
     def _init_ui(self):
         """Inicjalizacja interfejsu użytkownika."""
@@ -148,6 +244,7 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         
         # Panel informacji (górny pasek)
         self.info_label = QtWidgets.QLabel()
+        self.info_label.setTextFormat(QtCore.Qt.PlainText)  # tekst bez HTML - bez parsera rich-text
         self.info_label.setStyleSheet("""
             QLabel {
                 background-color: #f0f0f0;
@@ -170,23 +267,40 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         self.track_plot.setLabel('left', 'Y [m]')
         self.track_plot.showGrid(x=True, y=True, alpha=0.3)
         
-        # Rysowanie toru (statyczne, nie będzie aktualizowane)
-        self.track_plot.plot(self.track.track_x, self.track.track_y, 
-                            pen=pg.mkPen('k', width=3), name='Tor')
-        self.track_plot.plot(self.track.inner_x, self.track.inner_y, 
-                            pen=pg.mkPen('k', width=1, style=QtCore.Qt.DashLine))
-        
-        # Pojazd (dynamiczny)
-        self.car_marker = pg.ScatterPlotItem(size=15, pen=pg.mkPen(None), 
-                                            brush=pg.mkBrush('r'))
-        self.track_plot.addItem(self.car_marker)
-        
-        # Kierunek pojazdu (strzałka)
-        self.car_arrow = pg.PlotDataItem(pen=pg.mkPen('r', width=3))
-        self.track_plot.addItem(self.car_arrow)
+        # Widok toru jest stały - bez przesuwania/zoomu i menu kontekstowego
+        self.track_plot.setMouseEnabled(False, False)
+        self.track_plot.setMenuEnabled(False)
+        
+        # Rysowanie toru (statyczne, nie będzie aktualizowane) - rasteryzowane raz
+        # do pamięci podręcznej i tylko kopiowane przy odświeżaniu sceny
+        outer_item = self.track_plot.plot(self.track.track_x, self.track.track_y, 
+                                          pen=self.PEN_TRACK, name='Tor')
+        inner_item = self.track_plot.plot(self.track.inner_x, self.track.inner_y, 
+                                          pen=self.PEN_TRACK_INNER)
+        for item in (outer_item, inner_item):
+            item.curve.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+        
+        # Pojazd (dynamiczny) - znacznik i strzałka w jednej grupie, przesuwanej
+        # i obracanej jedną transformacją
+        self.car_group = QtWidgets.QGraphicsItemGroup()
+        self.car_group.setVisible(False)
+        
+        # Znacznik - elipsa 15 px niezależnie od skali widoku
+        self.car_marker = QtWidgets.QGraphicsEllipseItem(-7.5, -7.5, 15, 15)
+        self.car_marker.setFlag(QtWidgets.QGraphicsItem.ItemIgnoresTransformations)
+        self.car_marker.setPen(self.PEN_NONE)
+        self.car_marker.setBrush(self.BRUSH_CAR)
+        self.car_group.addToGroup(self.car_marker)
+        
+        # Kierunek pojazdu (strzałka 5 m wzdłuż lokalnej osi X grupy)
+        self.car_arrow = QtWidgets.QGraphicsLineItem(0, 0, 5, 0)
+        self.car_arrow.setPen(self.PEN_ARROW)
+        self.car_group.addToGroup(self.car_arrow)
+        
+        self.track_plot.addItem(self.car_group)
         
         # Ślad pojazdu
-        self.car_trail = pg.PlotDataItem(pen=pg.mkPen('b', width=2, style=QtCore.Qt.DotLine))
+        self.car_trail = pg.PlotDataItem(pen=self.PEN_TRAIL)
         self.track_plot.addItem(self.car_trail)
         
     def _setup_time_plots(self):
@@ -197,9 +311,8 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         self.speed_plot.showGrid(x=True, y=True, alpha=0.3)
         self.speed_plot.setYRange(0, 35)
         
-        self.speed_curve = self.speed_plot.plot(pen=pg.mkPen('b', width=2), name='Rzeczywista')
-        self.target_curve = self.speed_plot.plot(pen=pg.mkPen('g', width=2, style=QtCore.Qt.DashLine), 
-                                                 name='Docelowa')
+        self.speed_curve = self.speed_plot.plot(pen=self.PEN_SPEED, name='Rzeczywista')
+        self.target_curve = self.speed_plot.plot(pen=self.PEN_TARGET, name='Docelowa')
         
         # Throttle
         self.throttle_plot.setLabel('left', 'Throttle [%]')
@@ -207,7 +320,15 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         self.throttle_plot.showGrid(x=True, y=True, alpha=0.3)
         self.throttle_plot.setYRange(0, 100)
         
-        self.throttle_curve = self.throttle_plot.plot(pen=pg.mkPen('r', width=2))
+        self.throttle_curve = self.throttle_plot.plot(pen=self.PEN_THROTTLE)
+        
+        # Wspólna oś czasu - przewijanie okna ustawiane tylko na wykresie prędkości
+        self.throttle_plot.setXLink(self.speed_plot)
+        
+        # Downsampling (z zachowaniem ekstremów) i przycinanie do widoku po stronie pyqtgraph
+        for plot in (self.speed_plot, self.throttle_plot):
+            plot.setDownsampling(auto=True, mode='peak')
+            plot.setClipToView(True)
         
     def _create_control_panel(self):
         """Tworzy panel sterowania z suwakami i przyciskami."""
@@ -247,15 +368,15 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         buttons_layout = QtWidgets.QHBoxLayout()
         
         self.start_btn = QtWidgets.QPushButton("▶ Start")
-        self.start_btn.setStyleSheet("QPushButton { background-color: #90EE90; font-weight: bold; padding: 10px; }")
+        self.start_btn.setStyleSheet(self.STYLE_START)
         self.start_btn.clicked.connect(self._toggle_simulation)
         
         self.reset_btn = QtWidgets.QPushButton("🔄 Reset")
-        self.reset_btn.setStyleSheet("QPushButton { background-color: #FFB6C1; font-weight: bold; padding: 10px; }")
+        self.reset_btn.setStyleSheet(self.STYLE_RESET)
         self.reset_btn.clicked.connect(self._reset_simulation)
         
         self.mode_btn = QtWidgets.QPushButton("🤖 Tryb: FUZZY")
-        self.mode_btn.setStyleSheet("QPushButton { background-color: #FFFFE0; font-weight: bold; padding: 10px; }")
+        self.mode_btn.setStyleSheet(self.STYLE_MODE_FUZZY)
         self.mode_btn.clicked.connect(self._toggle_mode)
         
         buttons_layout.addWidget(self.start_btn)
@@ -286,16 +407,16 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         slider.setTickPosition(QtWidgets.QSlider.TicksBelow)
         slider.setTickInterval(int((max_val - min_val) / step / 10))
         
-        label = QtWidgets.QLabel(f"{default:.1f}")
+        # Jeden współczynnik: wartość fizyczna = pozycja suwaka * _factor
+        slider._factor = step * scale
+        
+        label = QtWidgets.QLabel()
+        label.setNum(slider.value() * slider._factor)
         label.setMinimumWidth(50)
         label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
         
-        # Zmiana: przechowujemy step i scale w sliderze
-        slider._step = step
-        slider._scale = scale
-        
         def update_label(value):
-            label.setText(f"{value * step * scale:.1f}")
+            label.setNum(value * slider._factor)
             
         slider.valueChanged.connect(update_label)
         
@@ -306,17 +427,17 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
     
     def _update_car_params(self):
         """Aktualizuje parametry pojazdu."""
-        self.car.mass = self.mass_slider.value() * self.mass_slider._step * self.mass_slider._scale
-        self.car.drag_coeff = self.drag_slider.value() * self.drag_slider._step * self.drag_slider._scale
-        self.car.max_throttle = self.power_slider.value() * self.power_slider._step * self.power_slider._scale
+        self.car.mass = self.mass_slider.value() * self.mass_slider._factor
+        self.car.drag_coeff = self.drag_slider.value() * self.drag_slider._factor
+        self.car.max_throttle = self.power_slider.value() * self.power_slider._factor
         
     def _update_target_speed(self):
         """Aktualizuje prędkość docelową."""
-        self.target_speed = self.target_slider.value() * self.target_slider._step * self.target_slider._scale
+        self.target_speed = self.target_slider.value() * self.target_slider._factor
         
     def _update_manual_throttle(self):
         """Aktualizuje manualny throttle."""
-        self.manual_throttle = self.manual_throttle_slider.value() * self.manual_throttle_slider._step * self.manual_throttle_slider._scale
+        self.manual_throttle = self.manual_throttle_slider.value() * self.manual_throttle_slider._factor
         
     def _toggle_simulation(self):
         """Uruchamia/zatrzymuje symulację."""
@@ -324,23 +445,33 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         if self.running:
             self.start_btn.setText("⏸ Pause")
             self.timer.start()
+            self.viz_timer.start()
         else:
             self.start_btn.setText("▶ Start")
             self.timer.stop()
+            self.viz_timer.stop()
+            self._visualization_frame()
+            self._update_info_label()
             
     def _reset_simulation(self):
         """Resetuje symulację do stanu początkowego."""
         self.running = False
         self.timer.stop()
+        self.viz_timer.stop()
         self.start_btn.setText("▶ Start")
         
         self.time = 0.0
-        self.sim_step_counter = 0
+        self.frame_counter = 0
+        self.last_info_values = None  # wartości ostatnio wyświetlone w pasku informacji
+        self.last_pose = None
         self.car.reset()
         
         # Czyszczenie historii
-        for key in self.history:
-            self.history[key].clear()
+        self.history_head = 0
+        self.history_count = 0
+        self.drawn_history = None
+        self.trail_head = 0
+        self.trail_count = 0
         
         # Czyszczenie wykresów
         self.speed_curve.setData([], [])
@@ -355,110 +486,165 @@ class FuzzyCarUI(QtWidgets.QMainWindow):
         self.manual_mode = not self.manual_mode
         if self.manual_mode:
             self.mode_btn.setText("👤 Tryb: MANUAL")
-            self.mode_btn.setStyleSheet("QPushButton { background-color: #ADD8E6; font-weight: bold; padding: 10px; }")
+            self.mode_btn.setStyleSheet(self.STYLE_MODE_MANUAL)
         else:
             self.mode_btn.setText("🤖 Tryb: FUZZY")
-            self.mode_btn.setStyleSheet("QPushButton { background-color: #FFFFE0; font-weight: bold; padding: 10px; }")
+            self.mode_btn.setStyleSheet(self.STYLE_MODE_FUZZY)
     
     def _simulation_step(self):
-        """Główna pętla symulacji - wywoływana przez timer."""
+        """
+        Główna pętla symulacji - wywoływana przez timer.
+        
+        Wykonuje self.substeps kroków na wywołanie (interwał timera jest
+        odpowiednio dłuższy), co rozkłada koszt obsługi sygnału Qt na kilka kroków.
+        """
         if not self.running:
             return
         
-        # Aktualna pozycja na torze
-        x, y, angle = self.track.get_position(self.car.position)
+        # Atrybuty używane w pętli wiązane lokalnie (jedno wyszukiwanie na wywołanie)
+        car = self.car
+        get_position = self.track.get_position
+        compute_throttle = self.controller.compute_throttle
+        append_history = self._append_history
+        manual_mode = self.manual_mode
         
-        # Prędkość docelowa
+        # Prędkość docelowa (w km/h liczona raz na wywołanie)
         target_speed = self.target_speed
+        ms_to_kmh = self.MS_TO_KMH
+        target_kmh = target_speed * ms_to_kmh
         
-        # Obliczenie błędu prędkości (w km/h dla kontrolera)
-        speed_error = (target_speed - self.car.speed) * 3.6
-        
-        # Obliczenie throttle
-        if self.manual_mode:
-            throttle = self.manual_throttle
-        else:
-            throttle = self.controller.compute_throttle(speed_error, self.car.acceleration)
-        
-        # Aktualizacja stanu pojazdu
-        self.car.update(throttle)
-        self.time += self.car.dt
-        
-        # Zapisanie historii
-        self._append_history(x, y, target_speed, throttle, speed_error)
+        for _ in range(self.substeps):
+            # Aktualna pozycja na torze
+            x, y, tx, ty = get_position(car.position)
+            
+            # Obliczenie błędu prędkości (w km/h dla kontrolera)
+            speed_error = target_kmh - car.speed * ms_to_kmh
+            
+            # Obliczenie throttle
+            if manual_mode:
+                throttle = self.manual_throttle
+            else:
+                throttle = compute_throttle(speed_error, car.acceleration)
+            
+            # Aktualizacja stanu pojazdu
+            car.update_inplace(throttle)
+            self.time += car.dt
+            
+            # Zapisanie historii (rysowaniem zajmuje się timer wizualizacji)
+            append_history(x, y, target_speed, throttle, speed_error)
         
-        # Aktualizacja wizualizacji (z redukcją częstotliwości)
-        self.sim_step_counter += 1
-        if self.sim_step_counter >= self.viz_update_interval:
-            self._update_visualization(x, y, angle)
-            self.sim_step_counter = 0
+        # Wizualizacja potrzebuje tylko pozycji z ostatniego kroku
+        self.last_pose = (x, y, tx, ty)
+    
+    def _visualization_frame(self):
+        """Klatka wizualizacji - wywoływana przez viz_timer."""
+        if self.last_pose is not None:
+            self._update_visualization(*self.last_pose)
     
     def _append_history(self, x, y, target_speed, throttle, speed_error):
-        """Dodaje dane do historii z ograniczeniem długości."""
-        self.history['time'].append(self.time)
-        self.history['speed'].append(self.car.speed)
-        self.history['target_speed'].append(target_speed)
-        self.history['throttle'].append(throttle)
-        self.history['speed_error'].append(speed_error)
-        self.history['position_x'].append(x)
-        self.history['position_y'].append(y)
-        
-        # Ograniczenie długości historii
-        if len(self.history['time']) > self.max_history_length:
-            for key in self.history:
-                self.history[key].pop(0)
+        """Zapisuje próbkę do buforów cyklicznych (najstarsza jest nadpisywana)."""
+        head = self.history_head
+        for index in (head, head + self.max_history_length):
+            self.history['time'][index] = self.time
+            self.history['speed'][index] = self.car.speed
+            self.history['target_speed'][index] = target_speed
+            self.history['throttle'][index] = throttle
+            self.history['speed_error'][index] = speed_error
+            self.history['position_x'][index] = x
+            self.history['position_y'][index] = y
+        
+        self.history_head = (head + 1) % self.max_history_length
+        self.history_count = min(self.history_count + 1, self.max_history_length)
+        
+        trail_head = self.trail_head
+        self.trail[0, trail_head] = self.trail[0, trail_head + self.trail_length] = x
+        self.trail[1, trail_head] = self.trail[1, trail_head + self.trail_length] = y
+        self.trail_head = (trail_head + 1) % self.trail_length
+        self.trail_count = min(self.trail_count + 1, self.trail_length)
+    
+    def _history_view(self, key, length=None):
+        """
+        Zwraca ostatnie próbki historii w kolejności chronologicznej (widok, bez kopii).
+        
+        Args:
+            key: nazwa serii w self.history
+            length: liczba ostatnich próbek (domyślnie cała historia)
+        """
+        if length is None or length > self.history_count:
+            length = self.history_count
+        start = self.history_head + self.max_history_length - length
+        return self.history[key][start:start + length]
+    
+    def _last_history(self, key):
+        """Zwraca ostatnią zapisaną wartość serii lub 0, gdy historia jest pusta."""
+        if not self.history_count:
+            return 0.0
+        return self.history[key][self.history_head - 1]
     
-    def _update_visualization(self, x, y, angle):
+    def _update_visualization(self, x, y, tx, ty):
         """Aktualizuje wszystkie elementy wizualizacji."""
-        # Pozycja pojazdu
-        self.car_marker.setData([x], [y])
-        
-        # Kierunek pojazdu (strzałka)
-        arrow_length = 5
-        dx = arrow_length * np.cos(angle)
-        dy = arrow_length * np.sin(angle)
-        self.car_arrow.setData([x, x + dx], [y, y + dy])
-        
-        # Ślad pojazdu (ostatnie 50 punktów)
-        trail_length = min(50, len(self.history['position_x']))
-        if trail_length > 0:
-            self.car_trail.setData(
-                self.history['position_x'][-trail_length:],
-                self.history['position_y'][-trail_length:]
-            )
+        # Pozycja i kierunek pojazdu - macierz obrotu wprost z wektora stycznego
+        # (oś X grupy -> (tx, ty)) plus przesunięcie do (x, y)
+        self.car_group.setTransform(QtGui.QTransform(tx, ty, -ty, tx, x, y))
+        self.car_group.setVisible(True)
         
-        # Aktualizacja wykresów czasowych
-        if len(self.history['time']) > 1:
-            # Downsampling dla wydajności - pokazuj co N-ty punkt
-            downsample = max(1, len(self.history['time']) // 100)
-            
-            time_data = self.history['time'][::downsample]
-            speed_data = self.history['speed'][::downsample]
-            target_data = self.history['target_speed'][::downsample]
-            throttle_data = self.history['throttle'][::downsample]
-            
-            self.speed_curve.setData(time_data, speed_data)
-            self.target_curve.setData(time_data, target_data)
-            self.throttle_curve.setData(time_data, throttle_data)
-            
-            # Automatyczne dopasowanie zakresu X (okno czasowe 20s)
-            time_window = 20
-            if self.time > time_window:
-                self.speed_plot.setXRange(self.time - time_window, self.time)
-                self.throttle_plot.setXRange(self.time - time_window, self.time)
+        # Ślad pojazdu (ostatnie trail_length punktów, widok bez kopii)
+        if self.trail_count > 0:
+            start = self.trail_head + self.trail_length - self.trail_count
+            trail = self.trail[:, start:start + self.trail_count]
+            self.car_trail.setData(trail[0], trail[1], connect='all', skipFiniteCheck=True)
         
-        # Aktualizacja informacji
-        self._update_info_label()
+        # Aktualizacja wykresów czasowych
+        if self.history_count > 1:
+            # Krzywe przeliczane tylko, gdy od ostatniej klatki doszły nowe dane
+            drawn = (self.history_head, self.history_count)
+            if drawn != self.drawn_history:
+                self.drawn_history = drawn
+                time_data = self._history_view('time')
+                speed_data = self._history_view('speed')
+                target_data = self._history_view('target_speed')
+                throttle_data = self._history_view('throttle')
+                
+                # Dane generowane wewnętrznie są zawsze skończone
+                self.speed_curve.setData(time_data, speed_data, connect='all', skipFiniteCheck=True)
+                self.target_curve.setData(time_data, target_data, connect='all', skipFiniteCheck=True)
+                self.throttle_curve.setData(time_data, throttle_data, connect='all', skipFiniteCheck=True)
+                
+                # Automatyczne dopasowanie zakresu X (okno czasowe 20s) - tylko
+                # po dopisaniu próbek; oś wykresu przepustnicy jest sprzężona
+                time_window = 20
+                if self.time > time_window:
+                    self.speed_plot.setXRange(self.time - time_window, self.time)
+        
+        # Aktualizacja informacji (rzadziej niż wykresy)
+        self.frame_counter += 1
+        if self.frame_counter >= self.info_update_interval:
+            self._update_info_label()
+            self.frame_counter = 0
     
     def _update_info_label(self):
-        """Aktualizuje pasek informacyjny."""
-        info_text = (
-            f"⏱️ Czas: {self.time:.1f}s  |  "
-            f"📍 Przebyty dystnans: {self.car.position:.1f}m  |  "
-            f"🏁 Prędkość: {self.car.speed:.1f} m/s ({self.car.speed*3.6:.1f} km/h)  |  "
-            f"🎯 Prędkość docelowa: {self.target_speed:.1f} m/s ({self.target_speed*3.6:.1f} km/h)  |  "
-            f"⚡ Przepustnica: {self.history['throttle'][-1] if self.history['throttle'] else 0:.1f}%  |  "
-            f"📊 Błąd: {self.history['speed_error'][-1] if self.history['speed_error'] else 0:.1f} km/h"
+        """Aktualizuje pasek informacyjny (tylko gdy zmieniła się wyświetlana wartość)."""
+        # Porównanie z dokładnością wyświetlania (0.1) - bez zmian nie ma setText
+        speed = self.car.speed
+        speed_kmh = speed * self.MS_TO_KMH
+        target_kmh = self.target_speed * self.MS_TO_KMH
+        throttle = float(self._last_history('throttle'))
+        speed_error = float(self._last_history('speed_error'))
+        values = (
+            round(self.time, 1), round(self.car.position, 1),
+            round(speed, 1), round(speed_kmh, 1),
+            round(self.target_speed, 1),
+            round(throttle, 1), round(speed_error, 1)
+        )
+        if values == self.last_info_values:
+            return
+        self.last_info_values = values
+        
+        info_text = self._format_info(
+            self.time, self.car.position,
+            speed, speed_kmh,
+            self.target_speed, target_kmh,
+            throttle, speed_error
         )
         self.info_label.setText(info_text)
 
@@ -470,6 +656,15 @@ def main():
     print("=" * 70)
     print()
     
+    # Renderowanie krzywych przez OpenGL, jeśli PyOpenGL jest dostępny
+    try:
+        import OpenGL  # noqa: F401
+        pg.setConfigOption('useOpenGL', True)
+        pg.setConfigOption('enableExperimental', True)
+        pg.setConfigOption('antialias', False)
+    except ImportError:
+        pass
+    
     app = QtWidgets.QApplication(sys.argv)
     
     # Styl aplikacji
@@ -0,0 +1,142 @@
+"""Testy modelu pojazdu (src/simulation/car_simulation.py)."""
+
+import unittest
+
+import numpy as np
+
+from src.simulation.car_simulation import CarSimulation, HistorySoA
+
+
+def _step_by_step(car, profile):
+    """Referencja: kolejne wywołania update() dla każdego kroku profilu."""
+    states = [car.update(value) for value in profile]
+    return {key: np.array([state[key] for state in states])
+            for key in ('position', 'speed', 'acceleration')}
+
+
+class SimulateBatchTest(unittest.TestCase):
+    
+    def test_matches_repeated_update(self):
+        # Odcinki stałego throttle, pojedyncze skoki i wartości do obcięcia
+        profile = np.concatenate([
+            np.full(40, 60.0), [10.0, 90.0, 90.0], np.full(25, 0.0),
+            np.linspace(-20.0, 130.0, 30), np.full(15, 100.0),
+        ])
+        batch_car = CarSimulation(mass=1200.0, drag_coeff=35.0)
+        step_car = CarSimulation(mass=1200.0, drag_coeff=35.0)
+        
+        batch = batch_car.simulate_batch(profile)
+        reference = _step_by_step(step_car, profile)
+        
+        for key in ('position', 'speed', 'acceleration'):
+            np.testing.assert_allclose(batch[key], reference[key], rtol=1e-9, atol=1e-9)
+        np.testing.assert_array_equal(batch['throttle'], np.clip(profile, 0, 100))
+        self.assertAlmostEqual(batch_car.position, step_car.position, places=9)
+        self.assertAlmostEqual(batch_car.speed, step_car.speed, places=9)
+    
+    def test_continues_from_current_state(self):
+        batch_car = CarSimulation()
+        step_car = CarSimulation()
+        batch_car.simulate_batch(np.full(20, 80.0))
+        batch = batch_car.simulate_batch(np.full(20, 30.0))
+        reference = _step_by_step(step_car, np.r_[np.full(20, 80.0), np.full(20, 30.0)])
+        
+        np.testing.assert_allclose(batch['speed'], reference['speed'][20:], rtol=1e-9)
+        np.testing.assert_allclose(batch['position'], reference['position'][20:], rtol=1e-9)
+    
+    def test_empty_profile(self):
+        car = CarSimulation()
+        car.update(50.0)
+        state = car.get_state()
+        
+        trajectory = car.simulate_batch([])
+        
+        for key in ('time', 'position', 'speed', 'acceleration', 'throttle'):
+            self.assertEqual(trajectory[key].shape, (0,))
+        self.assertEqual(car.get_state(), state)
+        self.assertEqual(len(car.history), 0)
+    
+    def test_records_history(self):
+        car = CarSimulation(dt=0.1)
+        trajectory = car.simulate_batch(np.full(5, 50.0), start_time=2.0)
+        
+        self.assertEqual(len(car.history), 5)
+        np.testing.assert_allclose(car.history['time'], 2.0 + 0.1 * np.arange(5))
+        np.testing.assert_array_equal(car.history['speed'], trajectory['speed'])
+
+
+class ZeroDragTest(unittest.TestCase):
+    """Bez oporu model przechodzi w ruch jednostajnie przyspieszony."""
+    
+    def test_update(self):
+        car = CarSimulation(drag_coeff=0.0, mass=1000.0, max_throttle=5000.0, dt=0.033)
+        state = car.update(50.0)
+        
+        accel = 2500.0 / 1000.0
+        self.assertAlmostEqual(state['acceleration'], accel, places=12)
+        self.assertAlmostEqual(state['speed'], accel * 0.033, places=12)
+        self.assertAlmostEqual(state['position'], 0.5 * accel * 0.033 ** 2, places=12)
+    
+    def test_batch_matches_update(self):
+        profile = np.r_[np.full(30, 70.0), np.full(30, 20.0)]
+        for drag in (0.0, 1e-12, 1e-6):
+            batch_car = CarSimulation(drag_coeff=drag)
+            step_car = CarSimulation(drag_coeff=drag)
+            batch = batch_car.simulate_batch(profile)
+            reference = _step_by_step(step_car, profile)
+            for key in ('position', 'speed', 'acceleration'):
+                np.testing.assert_allclose(batch[key], reference[key], rtol=1e-9, atol=1e-9)
+    
+    def test_small_drag_converges_to_zero_drag(self):
+        free = CarSimulation(drag_coeff=0.0)
+        nearly_free = CarSimulation(drag_coeff=1e-9)
+        for _ in range(100):
+            free.update(80.0)
+            nearly_free.update(80.0)
+        self.assertAlmostEqual(free.speed, nearly_free.speed, places=6)
+        self.assertAlmostEqual(free.position, nearly_free.position, places=6)
+
+
+class HistorySoATest(unittest.TestCase):
+    
+    def test_append_grows_and_keeps_samples(self):
+        history = HistorySoA(capacity=2)
+        for i in range(5):
+            history.append(i, 10.0 * i, 2.0 * i, -i, 50.0)
+        
+        self.assertEqual(len(history), 5)
+        self.assertGreaterEqual(history.capacity, 5)
+        np.testing.assert_array_equal(history['time'], np.arange(5.0))
+        np.testing.assert_array_equal(history['position'], 10.0 * np.arange(5))
+        np.testing.assert_array_equal(history['throttle'], np.full(5, 50.0))
+    
+    def test_extend_after_append(self):
+        history = HistorySoA(capacity=4)
+        history.append(0.0, 0.0, 0.0, 0.0, 0.0)
+        trajectory = {key: np.arange(1.0, 10.0) for key in HistorySoA.FIELDS}
+        history.extend(trajectory)
+        
+        self.assertEqual(len(history), 10)
+        np.testing.assert_array_equal(history['speed'], np.arange(10.0))
+    
+    def test_getitem_is_view_of_stored_samples(self):
+        history = HistorySoA()
+        history.append(1.0, 2.0, 3.0, 4.0, 5.0)
+        view = history['speed']
+        
+        self.assertEqual(view.shape, (1,))
+        self.assertTrue(np.shares_memory(view, history.arrays['speed']))
+    
+    def test_iteration_and_clear(self):
+        history = HistorySoA()
+        history.append(1.0, 2.0, 3.0, 4.0, 5.0)
+        self.assertEqual(list(history), list(HistorySoA.FIELDS))
+        self.assertEqual(dict(zip(history, (history[k][0] for k in history)))['acceleration'], 4.0)
+        
+        history.clear()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history['time'].shape, (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Testy kontrolera rozmytego (src/core_fuzzy)."""
+
+import os
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+import numpy as np
+
+from src.core_fuzzy import fuzzy_controller
+from src.core_fuzzy.fuzzy_controller import FuzzyThrottleController
+
+
+class FastPathParityTest(unittest.TestCase):
+    """Szybka ścieżka (_fast_kernel) musi odtwarzać wnioskowanie skfuzzy."""
+    
+    # Różnica wynika tylko z defuzyfikacji łamanej; throttle w procentach
+    TOLERANCE = 0.05
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.controller = FuzzyThrottleController()
+        # Siatka z krokiem zgodnym z CACHE_DECIMALS - wejścia nie są zaokrąglane
+        cls.errors = np.arange(-30.0, 30.01, 2.5)
+        cls.accels = np.arange(-10.0, 10.01, 1.0)
+    
+    def _skfuzzy_throttle(self, error, accel):
+        simulator = self.controller.simulator
+        simulator.input['speed_error'] = error
+        simulator.input['acceleration'] = accel
+        # skfuzzy 0.5 woła np.maximum z trzema argumentami pozycyjnymi
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            simulator.compute()
+        return simulator.output['throttle']
+    
+    def test_compute_throttle_matches_skfuzzy(self):
+        worst = max(
+            abs(self.controller.compute_throttle(e, a) - self._skfuzzy_throttle(e, a))
+            for e in self.errors for a in self.accels
+        )
+        self.assertLess(worst, self.TOLERANCE)
+    
+    def test_compute_surface_matches_compute_throttle(self):
+        surface = self.controller.compute_surface(self.errors, self.accels)
+        reference = np.array([[self.controller.compute_throttle(e, a) for e in self.errors]
+                              for a in self.accels])
+        self.assertEqual(surface.shape, (self.accels.size, self.errors.size))
+        np.testing.assert_allclose(surface, reference, atol=1e-3)
+    
+    def test_inputs_are_clipped(self):
+        controller = self.controller
+        self.assertEqual(controller.compute_throttle(100.0, 50.0),
+                         controller.compute_throttle(30.0, 10.0))
+        self.assertEqual(controller.compute_throttle(-100.0, -50.0),
+                         controller.compute_throttle(-30.0, -10.0))
+    
+    def test_output_in_range(self):
+        surface = self.controller.compute_surface(self.errors, self.accels)
+        self.assertTrue(np.all((surface >= 0.0) & (surface <= 100.0)))
+
+
+class ThrottleCacheTest(unittest.TestCase):
+    """Przebudowa tablic MF unieważnia pamięć podręczną compute_throttle."""
+    
+    def _shift_zero_error_term(self, controller):
+        # Term 'zero' błędu przesunięty o 5 km/h w prawo
+        term = controller.speed_error['zero']
+        term.mf = np.interp(controller.speed_error.universe - 5.0,
+                            controller.speed_error.universe, term.mf)
+    
+    def test_rebuilding_mf_tables_clears_cache(self):
+        controller = FuzzyThrottleController()
+        before = controller.compute_throttle(3.0, 0.0)
+        
+        self._shift_zero_error_term(controller)
+        controller._build_mf_tables()
+        after = controller.compute_throttle(3.0, 0.0)
+        
+        self.assertNotEqual(after, before)
+        controller._throttle_cache.clear()
+        self.assertEqual(controller.compute_throttle(3.0, 0.0), after)
+    
+    def test_preparing_fast_path_clears_cache(self):
+        controller = FuzzyThrottleController()
+        controller.compute_throttle(3.0, 0.0)
+        self.assertTrue(controller._throttle_cache)
+        
+        controller._prepare_fast_path()
+        self.assertFalse(controller._throttle_cache)
+
+
+class SurfaceCacheTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.controller = FuzzyThrottleController()
+    
+    def test_key_follows_membership_functions(self):
+        controller = FuzzyThrottleController()
+        before = controller._compute_config_hash()
+        controller._mf_tables['acceleration']['zero'][10] += 0.25
+        self.assertNotEqual(controller._compute_config_hash(), before)
+    
+    def test_key_follows_algorithm_version(self):
+        before = self.controller._compute_config_hash()
+        with mock.patch.object(fuzzy_controller, 'SURFACE_CACHE_VERSION',
+                               fuzzy_controller.SURFACE_CACHE_VERSION + 1):
+            self.assertNotEqual(self.controller._compute_config_hash(), before)
+    
+    def test_cache_writes_only_to_given_directory(self):
+        x = np.arange(-30, 31, 6)
+        y = np.arange(-10, 11, 5)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cached = fuzzy_controller._surface_cache(cache_dir)
+            key = self.controller._compute_config_hash()
+            first = cached(key, x, y, controller=self.controller)
+            self.assertTrue(os.listdir(cache_dir))
+            
+            with mock.patch.object(self.controller, 'compute_surface',
+                                   side_effect=AssertionError('cache miss')):
+                second = cached(key, x, y, controller=self.controller)
+            np.testing.assert_array_equal(first, second)
+            np.testing.assert_array_equal(first, self.controller.compute_surface(x, y))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Testy geometrii toru (OvalTrack z src/ui/ui_app.py)."""
+
+import math
+import unittest
+
+import numpy as np
+
+try:
+    from src.ui.ui_app import OvalTrack
+except ImportError:  # brak PyQt5/pyqtgraph w środowisku
+    OvalTrack = None
+
+
+@unittest.skipIf(OvalTrack is None, "wymaga PyQt5 i pyqtgraph")
+class OvalTrackTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.track = OvalTrack(width=100, height=60)
+        cls.table = np.array(cls.track._positions)
+    
+    def test_samples_are_evenly_spaced_by_arc_length(self):
+        xy = self.table[:, :2]
+        spacing = np.hypot(*np.diff(xy, axis=0).T)
+        np.testing.assert_allclose(spacing, OvalTrack.POSITION_STEP, rtol=1e-4)
+        
+        # Domknięcie okrążenia: od ostatniego slotu do startu zostaje < 1 krok
+        closing = math.hypot(*(xy[0] - xy[-1]))
+        self.assertLessEqual(closing, OvalTrack.POSITION_STEP * (1 + 1e-4))
+        self.assertGreater(closing, 0.0)
+    
+    def test_points_lie_on_ellipse_with_unit_tangent(self):
+        x, y, tx, ty = self.table.T
+        a, b = self.track.a, self.track.b
+        np.testing.assert_allclose((x / a) ** 2 + (y / b) ** 2, 1.0, atol=1e-9)
+        np.testing.assert_allclose(np.hypot(tx, ty), 1.0, atol=1e-12)
+        # Styczna prostopadła do normalnej (x / a², y / b²)
+        np.testing.assert_allclose(tx * x / a**2 + ty * y / b**2, 0.0, atol=1e-9)
+    
+    def test_index_stays_in_table_and_wraps(self):
+        track = self.track
+        perimeter = track.perimeter
+        for distance in (0.0, perimeter - 1e-12, math.nextafter(perimeter, 0.0),
+                         perimeter, 3 * perimeter + 0.05, 1e6 + 0.123):
+            pose = track.get_position(distance)
+            self.assertEqual(len(pose), 4)
+        
+        self.assertEqual(track.get_position(0.0), track._positions[0])
+        self.assertEqual(track.get_position(perimeter), track._positions[0])
+        self.assertEqual(track.get_position(2 * perimeter + 12.34), track.get_position(12.34))
+        self.assertEqual(track.get_position(math.nextafter(perimeter, 0.0)), track._positions[-1])
+    
+    def test_start_pose(self):
+        x, y, tx, ty = self.track.get_position(0.0)
+        self.assertAlmostEqual(x, self.track.a)
+        self.assertAlmostEqual(y, 0.0)
+        self.assertAlmostEqual(tx, 0.0)
+        self.assertAlmostEqual(ty, 1.0)
+    
+    def test_other_track_sizes(self):
+        for width, height in ((60, 60), (200, 40), (30.5, 17.25)):
+            track = OvalTrack(width, height)
+            self.assertEqual(len(track._positions),
+                             int(track.perimeter * (1.0 / OvalTrack.POSITION_STEP)) + 1)
+            track.get_position(math.nextafter(track.perimeter, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()